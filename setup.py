@@ -0,0 +1,14 @@
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(['src/_maxheapc.pyx'], language_level=3)
+except ImportError:
+    # The accelerator is optional; the pure Python module works without it.
+    ext_modules = []
+
+setup(
+    name='maxheap',
+    packages=['src'],
+    ext_modules=ext_modules,
+)
@@ -0,0 +1,91 @@
+# cython: language_level=3
+"""C accelerator for the max heap primitives.
+
+Mirrors CPython's `_heapqmodule.c` with the comparison sense inverted
+(`Py_GT` instead of `Py_LT`) so the semantics match `src.maxheap`.
+Build with `python setup.py build_ext --inplace`; `src.maxheap` falls
+back to the pure Python implementation when this module is missing.
+"""
+
+from cpython.object cimport PyObject_RichCompareBool, Py_GT
+
+__all__ = ['heappush', 'heappop', 'heapify', 'heapreplace', 'heappushpop']
+
+
+cdef int _siftdown_max(list heap, Py_ssize_t startpos, Py_ssize_t pos) except -1:
+    cdef object cur_item = heap[pos]
+    cdef object parent
+    cdef Py_ssize_t parent_pos
+    while pos > startpos:
+        parent_pos = (pos - 1) >> 1
+        parent = heap[parent_pos]
+        if PyObject_RichCompareBool(cur_item, parent, Py_GT):
+            heap[pos] = parent
+            pos = parent_pos
+            continue
+        break
+    heap[pos] = cur_item
+    return 0
+
+
+cdef int _siftup_max(list heap, Py_ssize_t pos) except -1:
+    cdef Py_ssize_t startpos = pos
+    cdef Py_ssize_t endpos = len(heap)
+    cdef Py_ssize_t child_pos, right_pos
+    cdef object cur_item = heap[pos]
+    # Bubble the larger child up until a leaf is reached, then sift
+    # cur_item back toward the root (fewer comparisons than testing
+    # cur_item against each child on the way down).
+    child_pos = (2 * pos) + 1
+    while child_pos < endpos:
+        right_pos = child_pos + 1
+        if right_pos < endpos and not PyObject_RichCompareBool(
+                heap[child_pos], heap[right_pos], Py_GT):
+            child_pos = right_pos
+        heap[pos] = heap[child_pos]
+        pos = child_pos
+        child_pos = (2 * pos) + 1
+    heap[pos] = cur_item
+    _siftdown_max(heap, startpos, pos)
+    return 0
+
+
+def heappush(list heap not None, item):
+    """Push item onto heap, maintaining the heap invariant."""
+    heap.append(item)
+    _siftdown_max(heap, 0, len(heap) - 1)
+
+
+def heappop(list heap not None):
+    """Pop the biggest item off the heap, maintaining the heap invariant."""
+    lastelt = heap.pop()    # raises appropriate IndexError if heap is empty
+    if heap:
+        return_item = heap[0]
+        heap[0] = lastelt
+        _siftup_max(heap, 0)
+        return return_item
+    return lastelt
+
+
+def heapreplace(list heap not None, item):
+    """Pop and return the current biggest value, and add the new item."""
+    return_item = heap[0]
+    heap[0] = item
+    _siftup_max(heap, 0)
+    return return_item
+
+
+def heappushpop(list heap not None, item):
+    """Fast version of a heappush followed by a heappop."""
+    if heap and PyObject_RichCompareBool(heap[0], item, Py_GT):
+        item, heap[0] = heap[0], item
+        _siftup_max(heap, 0)
+    return item
+
+
+def heapify(list array not None):
+    """Transform list into a max heap, in-place, in O(len(array)) time."""
+    cdef Py_ssize_t n = len(array)
+    cdef Py_ssize_t i
+    for i in range((n // 2) - 1, -1, -1):
+        _siftup_max(array, i)
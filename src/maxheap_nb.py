@@ -0,0 +1,78 @@
+"""Numba-compiled max heap kernels for 1-D numeric numpy arrays.
+
+Importing this module requires numpy and numba; `src.maxheap` imports it
+lazily and falls back to the pure Python loops when either is missing.
+The kernels avoid allocations and per-iteration attribute lookups so the
+whole sift loop compiles to native code.
+"""
+
+from numba import njit
+
+
+@njit(cache=True)
+def _siftdown_nb(a, pos, n):
+    cur_item = a[pos]
+    child_pos = (2 * pos) + 1
+    while child_pos < n:
+        right_pos = child_pos + 1
+        if right_pos < n and a[child_pos] < a[right_pos]:
+            child_pos = right_pos
+        if cur_item < a[child_pos]:
+            a[pos] = a[child_pos]
+            pos = child_pos
+            child_pos = (2 * pos) + 1
+            continue
+        break
+    a[pos] = cur_item
+
+
+@njit(cache=True)
+def heapify_nb(a):
+    n = a.shape[0]
+    for i in range((n // 2) - 1, -1, -1):
+        _siftdown_nb(a, i, n)
+
+
+@njit(cache=True)
+def _siftdown_min_nb(a, pos, n):
+    cur_item = a[pos]
+    child_pos = (2 * pos) + 1
+    while child_pos < n:
+        right_pos = child_pos + 1
+        if right_pos < n and a[right_pos] < a[child_pos]:
+            child_pos = right_pos
+        if a[child_pos] < cur_item:
+            a[pos] = a[child_pos]
+            pos = child_pos
+            child_pos = (2 * pos) + 1
+            continue
+        break
+    a[pos] = cur_item
+
+
+@njit(cache=True)
+def nlargest_nb(n, a):
+    size = a.shape[0]
+    if n > size:
+        n = size
+    if n <= 0:
+        # bounds checking is off under njit, so the scan loop must not
+        # touch result[0] of an empty buffer
+        return a[:0].copy()
+    result = a[:n].copy()
+    # min heap of the n best candidates; the root is the cutoff
+    for i in range((n // 2) - 1, -1, -1):
+        _siftdown_min_nb(result, i, n)
+    for j in range(n, size):
+        elem = a[j]
+        if result[0] < elem:
+            result[0] = elem
+            _siftdown_min_nb(result, 0, n)
+    result.sort()
+    i = 0
+    j = n - 1
+    while i < j:
+        result[i], result[j] = result[j], result[i]
+        i += 1
+        j -= 1
+    return result
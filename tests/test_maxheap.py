@@ -1,4 +1,22 @@
 from unittest import TestCase
+from unittest import skipUnless
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    from src import maxheap_nb
+except ImportError:
+    maxheap_nb = None
+try:
+    from src import maxheap_batch
+except ImportError:
+    maxheap_batch = None
+try:
+    from src import _maxheapc
+except ImportError:
+    _maxheapc = None
 
 from src.maxheap import heapify
 from src.maxheap import merge
@@ -6,6 +24,8 @@ from src.maxheap import heappop
 from src.maxheap import heapreplace
 from src.maxheap import heappushpop
 from src.maxheap import heappush
+from src.maxheap import nlargest
+from src.maxheap import nsmallest
 
 
 class TestMaxHeap(TestCase):
@@ -69,6 +89,44 @@ class TestMaxHeap(TestCase):
         heappush(test_heap, 100)
         self.assertEqual(test_heap[0], 100)
 
+    def test_push_pop_with_key(self):
+        items = [{'p': 3}, {'p': 7}, {'p': 1}, {'p': 7}]
+        test_heap = []
+        for item in items:
+            heappush(test_heap, item, key=lambda d: d['p'])
+        popped = [heappop(test_heap, key=lambda d: d['p'])
+                  for _ in range(len(test_heap))]
+        self.assertEqual([d['p'] for d in popped], [7, 7, 3, 1])
+        # equal keys pop in push order
+        self.assertIs(popped[0], items[1])
+        self.assertIs(popped[1], items[3])
+
+    def test_heapify_and_replace_with_key(self):
+        test_heap = ['kangaroo', 'cat', 'horse']
+        heapify(test_heap, key=len)
+        popped = heapreplace(test_heap, 'fish', key=len)
+        self.assertEqual(popped, 'kangaroo')
+        self.assertEqual(heappushpop(test_heap, 'a', key=len), 'horse')
+
+    def test_nlargest(self):
+        test_array = [4, 6, 2, 1, 7, 9, 2, 6, 2, 1]
+        self.assertEqual(nlargest(3, iter(test_array)), [9, 7, 6])
+
+    def test_nlargest_with_key(self):
+        words = ['cat', 'kangaroo', 'fish', 'dog']
+        self.assertEqual(nlargest(2, words, key=len), ['kangaroo', 'fish'])
+
+    def test_nlargest_more_than_size(self):
+        self.assertEqual(nlargest(10, [3, 1, 2]), [3, 2, 1])
+
+    def test_nsmallest(self):
+        test_array = [4, 6, 2, 1, 7, 9, 2, 6, 2, 1]
+        self.assertEqual(nsmallest(3, iter(test_array)), [1, 1, 2])
+
+    def test_nsmallest_with_key(self):
+        words = ['cat', 'kangaroo', 'fish', 'dog']
+        self.assertEqual(nsmallest(2, words, key=len), ['cat', 'dog'])
+
     def test_merge_without_key(self):
         l1 = [5, 6, 2, 1, 3, 2]
         l2 = [7, 4 ,9 , 3, 1]
@@ -87,9 +145,116 @@ class TestMaxHeap(TestCase):
         result = list(merge(l1, l2, key=len))
         self.assertEqual(result, ['kangaroo', 'horse', 'fish', 'cat', 'dog'])
 
+    def test_merge_many_iterables(self):
+        streams = [sorted(range(i % 5), reverse=True) for i in range(50)]
+        result = list(merge(*streams))
+        expected = sorted((x for s in streams for x in s), reverse=True)
+        self.assertEqual(result, expected)
+
+    def test_merge_tie_goes_to_later_iterable(self):
+        l1 = [3, 2]
+        l2 = [2.0, 1]
+        result = list(merge(l1, l2))
+        self.assertEqual(result, [3, 2, 2, 1])
+        self.assertEqual([type(x) for x in result], [int, float, int, int])
+
+    def test_merge_tie_goes_to_later_iterable_tree_path(self):
+        # three inputs take the tournament-tree path, not _merge2
+        l1 = [3, 2]
+        l2 = [2.0, 1]
+        l3 = [True]
+        result = list(merge(l1, l2, l3))
+        self.assertEqual(result, [3, 2, 2, 1, 1])
+        self.assertEqual([type(x) for x in result],
+                         [int, float, int, bool, int])
+
+    def test_merge_reverse(self):
+        l1 = [1, 2, 3, 5, 6]
+        l2 = [1, 3, 4, 7, 9]
+        l3 = (10,)
+        result = list(merge(l1, l2, l3, reverse=True))
+        self.assertEqual(result, [1, 1, 2, 3, 3, 4, 5, 6, 7, 9, 10])
+
+    def test_merge_reverse_with_key(self):
+        l1 = ['horse', 'dog']
+        l2 = ['kangaroo', 'fish', 'cat']
+        l1 = sorted(l1, key=len)
+        l2 = sorted(l2, key=len)
+        result = list(merge(l1, l2, key=len, reverse=True))
+        self.assertEqual(result, ['cat', 'dog', 'fish', 'horse', 'kangaroo'])
+
     def test_merge_with_empty_collections(self):
         l1 = []
         l2 = set()
         l3 = tuple()
         result = list(merge(l1, l2, l3))
-        self.assertEqual(result, [])
\ No newline at end of file
+        self.assertEqual(result, [])
+
+@skipUnless(maxheap_nb is not None, 'requires numpy and numba')
+class TestNumbaKernels(TestCase):
+    def test_heapify_dispatches_to_numba_kernel(self):
+        test_array = numpy.array([4, 6, 2, 1, 7, 9, 2, 6, 2, 1])
+        heapify(test_array)
+        for i in range(len(test_array)):
+            cur_value = test_array[i]
+            left_index = (2 * i) + 1
+            right_index = left_index + 1
+            if left_index < len(test_array):
+                self.assertGreaterEqual(cur_value, test_array[left_index])
+            if right_index < len(test_array):
+                self.assertGreaterEqual(cur_value, test_array[right_index])
+
+    def test_heapify_nb_with_real(self):
+        test_array = numpy.array([5.5, 3, 7.4, 7.7, 1, 3.33, 10.15])
+        maxheap_nb.heapify_nb(test_array)
+        for i in range(len(test_array)):
+            cur_value = test_array[i]
+            left_index = (2 * i) + 1
+            right_index = left_index + 1
+            if left_index < len(test_array):
+                self.assertGreaterEqual(cur_value, test_array[left_index])
+            if right_index < len(test_array):
+                self.assertGreaterEqual(cur_value, test_array[right_index])
+
+    def test_nlargest_dispatches_to_numba_kernel(self):
+        test_array = numpy.array([4, 6, 2, 1, 7, 9, 2, 6, 2, 1])
+        self.assertEqual(nlargest(3, test_array), [9, 7, 6])
+        self.assertEqual(nlargest(0, test_array), [])
+        self.assertEqual(nlargest(20, test_array),
+                         sorted(test_array.tolist(), reverse=True))
+
+
+@skipUnless(maxheap_batch is not None, 'requires numpy and numba')
+class TestBatchedNLargest(TestCase):
+    def test_against_sorted(self):
+        rows = numpy.array([[4, 6, 2, 1, 7, 9, 2, 6, 2, 1],
+                            [5, 5, 3, 7, 7, 1, 3, 10, 0, -2],
+                            [-7, 10, 12, -33, -4, 2, 5, 3, -99, 0]])
+        for k in (0, 1, 3, rows.shape[1], rows.shape[1] + 5):
+            result = maxheap_batch.batched_nlargest(k, rows)
+            self.assertEqual(result.shape, (3, min(k, rows.shape[1])))
+            for row, got in zip(rows, result):
+                expected = sorted(row.tolist(), reverse=True)[:k]
+                self.assertEqual(got.tolist(), expected)
+
+
+@skipUnless(_maxheapc is not None, 'requires the built C extension')
+class TestCAccelerator(TestCase):
+    def test_push_pop_sorts(self):
+        data = [4, 6, 2, 1, 7, 9, 2, 6, 2, 1]
+        test_heap = []
+        for item in data:
+            _maxheapc.heappush(test_heap, item)
+        popped = [_maxheapc.heappop(test_heap) for _ in range(len(test_heap))]
+        self.assertEqual(popped, sorted(data, reverse=True))
+
+    def test_heapify_replace_pushpop(self):
+        test_heap = [4, 6, 2, 1, 7]
+        _maxheapc.heapify(test_heap)
+        self.assertEqual(_maxheapc.heapreplace(test_heap, 3), 7)
+        self.assertEqual(_maxheapc.heappushpop(test_heap, 100), 100)
+        self.assertEqual(_maxheapc.heappushpop(test_heap, 0), 6)
+
+    def test_pop_from_empty_heap(self):
+        with self.assertRaises(IndexError):
+            _maxheapc.heappop([])